@@ -1,10 +1,17 @@
+import math
 from abc import abstractmethod
-from typing import Optional, Tuple, Any, Iterable
+from typing import Optional, Any, Iterable, Union
 
 import numpy as np
 import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
 from pybhf.grid import Grid, GridAxis, GridIndex, GridKey, GridValue
 
+try:
+    from scipy.ndimage import convolve
+except ImportError:  # pragma: no cover - depends on the environment.
+    convolve = None
+
 
 class HistogramFilterBase:
     def __init__(
@@ -15,17 +22,27 @@ class HistogramFilterBase:
         unusable_cells: Iterable[GridIndex] = frozenset(),
         motion_noise: Optional[npt.ArrayLike] = None,
         observ_noise: Optional[npt.ArrayLike] = None,
+        dtype: npt.DTypeLike = GridValue,
+        seed: Union[None, int, np.random.SeedSequence] = None,
+        rng: Optional[np.random.Generator] = None,
     ) -> None:
+        if seed is not None and rng is not None:
+            raise ValueError("seed and rng cannot both be provided.")
+
         # Initialize the grid.
-        self._init_grid(x_axis, y_axis, zero_threshold, unusable_cells)
+        self._init_grid(x_axis, y_axis, zero_threshold, unusable_cells, dtype)
 
         # Initialize the motion noise and observation noise if provided.
         self._motion_noise, self._observation_noise = None, None
         self.set_motion_noise(motion_noise)
         self.set_observation_noise(observ_noise)
 
-        # Maintain a random sampler to prevent unnecessary recreation.
-        self._rng = np.random.default_rng()
+        # Maintain a random sampler to prevent unnecessary recreation. It is only created when first used. A shared
+        # SeedSequence is spawned here so that each filter gets an independent stream regardless of sampling order.
+        if isinstance(seed, np.random.SeedSequence):
+            seed = seed.spawn(1)[0]
+        self._seed = seed
+        self._rng = rng
 
     def __getitem__(self, key: GridKey) -> GridValue:
         return self._grid[key]
@@ -37,6 +54,12 @@ class HistogramFilterBase:
     def belief(self) -> Grid:
         return self._grid
 
+    @property
+    def rng(self) -> np.random.Generator:
+        if self._rng is None:
+            self._rng = np.random.default_rng(self._seed)
+        return self._rng
+
     @property
     def motion_noise(self) -> npt.NDArray:
         return self._motion_noise
@@ -45,57 +68,86 @@ class HistogramFilterBase:
     def observation_noise(self) -> npt.NDArray:
         return self._observation_noise
 
+    def _apply_motion(self, noise: Optional[npt.ArrayLike] = None) -> None:
+        """Convolves the belief with the noise (default: the motion noise) and rebuilds the nonzero cells."""
+        if noise is None:
+            noise = self._motion_noise
+        else:
+            noise = np.asarray(noise, dtype=np.float64)
+            if not self._is_valid_noise(noise):
+                raise ValueError(
+                    f"motion noise must be a square matrix that sums to 1."
+                )
+        belief = self._grid.data
+        belief[:] = self._convolve_belief(noise)
+        self._grid.rebuild_nonzero_cells()
+
+    def _convolve_belief(self, noise: npt.NDArray) -> npt.NDArray:
+        """Convolves the belief with a square kernel, treating cells outside the grid as zero."""
+        if convolve is not None:
+            return convolve(self._grid.data, noise, mode="constant", cval=0.0)
+
+        # Match scipy.ndimage.convolve: flip the kernel and, for even sizes, shift its center back by one cell.
+        size = noise.shape[0]
+        start = 1 - size % 2
+        padded = self._grid.padded_view(size // 2)
+        windows = sliding_window_view(padded[start:, start:], noise.shape)
+        return np.einsum("ijkl,kl->ij", windows, noise[::-1, ::-1])
+
     def _init_grid(
         self,
         x_axis: GridAxis,
         y_axis: GridAxis,
         zero_threshold: float,
         unusable_cells: Iterable[GridIndex],
+        dtype: npt.DTypeLike = GridValue,
     ) -> None:
-        self._grid: Grid = Grid(x_axis, y_axis, zero_threshold)
+        self._grid: Grid = Grid(x_axis, y_axis, zero_threshold, dtype)
         self._grid.set_unusable_cells(unusable_cells)
 
     @staticmethod
     def _is_valid_noise(noise: npt.NDArray) -> bool:
         """Checks if the noise parameter is 'valid.'"""
         return (
-            len(noise.shape) == 2
+            noise.ndim == 2
             and noise.shape[0] == noise.shape[1]
-            and np.sum(noise) == 1.0
+            and math.isclose(noise.sum(), 1.0)
         )
 
     def sample(self, n_samples: int = 1) -> npt.NDArray[GridValue]:
         # Get the cells with positive probabilities.
-        positive_prob_keys: Tuple[GridKey] = self._grid.get_nonzero_keys()
+        positive_prob_keys = self._grid.get_nonzero_keys()
         if len(positive_prob_keys) == 0:
             raise RuntimeError("There are no cells with positive values!")
 
-        # Randomly sample the cells with positive values.
-        probs = tuple((self._grid[key] for key in positive_prob_keys))
-        if (prob_sum := np.sum(probs)) != 1.0:
+        # Randomly sample the cells with positive values using the inverse CDF. The last CDF entry is the sum of the
+        # nonzero values, taken from the live grid whenever the CDF was rebuilt.
+        cdf = self._grid.get_nonzero_cdf()
+        if not math.isclose(prob_sum := cdf[-1], 1.0, abs_tol=1e-6):
             raise RuntimeError(
                 f"The probabilities for the nonzero keys sum to {prob_sum}."
             )
-        samples: npt.NDArray = self._rng.choice(
-            positive_prob_keys, size=n_samples, replace=True, p=probs, axis=0
+        # Scale the draws by the total to absorb any rounding in the probabilities.
+        indices = np.searchsorted(
+            cdf, self.rng.random(n_samples) * prob_sum, side="right"
         )
-        return samples
+        return positive_prob_keys[indices]
 
     def set_motion_noise(self, noise: Optional[npt.ArrayLike] = None) -> None:
         noise = [[1.0]] if noise is None else noise
-        noise = np.array(noise)
+        noise = np.array(noise, dtype=np.float64, copy=True)
         if not self._is_valid_noise(noise):
             raise ValueError(f"motion noise must be a square matrix that sums to 1.")
-        self._motion_noise = noise.copy()
+        self._motion_noise = noise
 
     def set_observation_noise(self, noise: Optional[npt.ArrayLike] = None) -> None:
         noise = [[1.0]] if noise is None else noise
-        noise = np.array(noise)
+        noise = np.array(noise, dtype=np.float64, copy=True)
         if not self._is_valid_noise(noise):
             raise ValueError(
                 f"observation noise must be a square matrix that sums to 1."
             )
-        self._observation_noise = noise.copy()
+        self._observation_noise = noise
 
     @abstractmethod
     def predict(self, command: Any) -> None:
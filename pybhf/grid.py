@@ -1,6 +1,6 @@
 from functools import cached_property
 from dataclasses import dataclass, field
-from typing import Tuple, Set, Iterable
+from typing import Set, Tuple, Iterable
 
 import numpy as np
 import numpy.typing as npt
@@ -21,6 +21,14 @@ GridKey = Tuple[AxisKey, AxisKey]
 GridValue = float
 """The type of each value in the array."""
 
+PackedGridIndex = int
+"""A grid index packed into a single integer. Format: (row_index << 32) | column_index."""
+
+INDEX_BITS = 32
+"""The number of bits used by the column index in a packed grid index."""
+
+_INDEX_MASK = (1 << INDEX_BITS) - 1
+
 
 @dataclass(frozen=True)
 class GridAxis:
@@ -44,10 +52,21 @@ class GridAxis:
     def _half_size(self) -> float:
         return self.size / 2.0
 
+    @cached_property
+    def _inv_size(self) -> float:
+        return 1.0 / self.size
+
     @cached_property
     def n_bins(self) -> int:
         return int((self.max - self.min) / self.size)
 
+    @cached_property
+    def centers(self) -> npt.NDArray[np.float64]:
+        """The key at the center of each cell, indexed by axis index."""
+        centers = np.arange(self.n_bins) * self.size + self.min + self._half_size
+        centers.flags.writeable = False
+        return centers
+
     def _is_valid_key(self, key: AxisKey) -> bool:
         return self.min <= key <= self.max
 
@@ -58,17 +77,26 @@ class GridAxis:
         return GridAxis(self.name, self.min, self.max, self.size)
 
     def get_index(self, key: AxisKey) -> AxisIndex:
-        # Sanity check.
+        # Sanity check. This also rejects NaN keys.
         if not self._is_valid_key(key):
             raise IndexError(
                 f"{self.name}-axis key ({key}) is out-of-bounds. Range: [{self.min}, {self.max}]."
             )
-        index = self.n_bins - 1
-        if key < self.max:
-            index = (key - self.min) / self.size
-        return int(
-            index + self.epsilon
-        )  # Round to negate any effects from decimal rounding errors.
+        # Add epsilon to negate any effects from decimal rounding errors.
+        index = int((key - self.min) * self._inv_size + self.epsilon)
+        return index if index < self.n_bins else self.n_bins - 1
+
+    def get_indices(self, keys: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """Vectorized version of `get_index` for an array of keys."""
+        keys = np.asarray(keys, dtype=np.float64)
+        is_invalid = ~((keys >= self.min) & (keys <= self.max))  # Also rejects NaN.
+        if is_invalid.any():
+            raise IndexError(
+                f"{self.name}-axis key ({keys[is_invalid][0]}) is out-of-bounds. Range: [{self.min}, {self.max}]."
+            )
+        # Use the same arithmetic as `get_index` so that both agree on every key.
+        indices = ((keys - self.min) * self._inv_size + self.epsilon).astype(np.int64)
+        return np.minimum(indices, self.n_bins - 1)
 
     def get_key(self, index: AxisIndex) -> AxisKey:
         if not self._is_valid_index(index):
@@ -92,7 +120,11 @@ class GridAxis:
 
 class Grid:
     def __init__(
-        self, x_axis: GridAxis, y_axis: GridAxis, zero_threshold: float = 0.00001
+        self,
+        x_axis: GridAxis,
+        y_axis: GridAxis,
+        zero_threshold: float = 0.00001,
+        dtype: npt.DTypeLike = GridValue,
     ) -> None:
         self._x_axis, self._y_axis = x_axis.copy(), y_axis.copy()
         self._zero_threshold = zero_threshold
@@ -106,24 +138,56 @@ class Grid:
             )
         if self._zero_threshold < 0.0:
             raise ValueError(f"zero threshold must be at least zero.")
+        if not np.issubdtype(dtype, np.floating):
+            raise TypeError(f"dtype ({dtype}) must be a floating point type.")
 
-        # Create the grid.
-        self._grid = np.empty(
-            (self._y_axis.n_bins, self._x_axis.n_bins), dtype=GridValue
-        )
-        self._grid[:] = 0.0
+        # Create the grid. A float32 grid halves the memory traffic of large grids, but its values (and their sums) are
+        # only accurate to about 1e-6.
+        self._grid = np.zeros((self._y_axis.n_bins, self._x_axis.n_bins), dtype=dtype)
         self._sig_digits = 8
-        self._nonzero_cells: Set[Tuple[int, int]] = set()
+        self._nonzero_cells: Set[PackedGridIndex] = set()
+        self._usable_mask = np.ones(self._grid.shape, dtype=bool)
+
+        # Cumulative sum of the nonzero cell values. It is only rebuilt when a cell changes.
+        self._cdf = np.zeros(0, dtype=GridValue)
+        self._cdf_dirty = False
+
+        # Zero-padded copy of the grid, sized for the largest padding requested so far.
+        self._padded = np.zeros((0, 0), dtype=dtype)
+        self._padded_pad = -1
 
     @property
     def data(self) -> npt.NDArray[GridValue]:
-        """Returns a reference to the grid."""
+        """Returns a reference to the grid. Call `rebuild_nonzero_cells()` after writing to it directly."""
         return self._grid
 
+    @property
+    def data_view(self) -> npt.NDArray[GridValue]:
+        """Returns a read-only, C-contiguous view of the grid."""
+        view = np.ascontiguousarray(self._grid).view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def usable_mask(self) -> npt.NDArray[np.bool_]:
+        """Returns a read-only view of the mask of usable cells."""
+        view = self._usable_mask.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._grid.dtype
+
     @cached_property
     def volume(self) -> float:
         return round(self._x_axis.size * self._y_axis.size, self._sig_digits)
 
+    @property
+    def total(self) -> float:
+        """Returns the sum of the grid values."""
+        return float(self._grid.sum(dtype=np.float64))
+
     @property
     def x_axis(self) -> GridAxis:
         return self._x_axis
@@ -133,13 +197,19 @@ class Grid:
         return self._y_axis
 
     def __eq__(self, other: "Grid") -> bool:
+        # Order the checks from cheapest to most expensive so that mismatches short-circuit early.
         return (
-            self._x_axis == other._x_axis
-            and self._y_axis == other._y_axis
+            isinstance(other, Grid)
             and self._zero_threshold == other._zero_threshold
-            and np.allclose(self._grid, other._grid)
             and self._sig_digits == other._sig_digits
-            and self._nonzero_cells == self._nonzero_cells
+            and self._x_axis == other._x_axis
+            and self._y_axis == other._y_axis
+            and self._nonzero_cells == other._nonzero_cells
+            and np.array_equal(self._usable_mask, other._usable_mask)
+            and (
+                np.array_equal(self._grid, other._grid)
+                or np.allclose(self._grid, other._grid)
+            )
         )
 
     def __getitem__(self, key: GridKey) -> GridValue:
@@ -148,12 +218,73 @@ class Grid:
 
     def __setitem__(self, key: GridKey, value: GridValue) -> None:
         index = self._get_grid_index(key)
-        if value >= self._zero_threshold:
-            self._nonzero_cells.add(index)
-        else:
-            value = 0.0
-            self._nonzero_cells.discard(index)
         self._grid[index] = value
+        # Compare against the threshold in the grid's precision.
+        value = self._grid.item(index)
+        packed_index = (index[0] << INDEX_BITS) | index[1]
+        if value >= self._zero_threshold and self._usable_mask[index]:
+            self._nonzero_cells.add(packed_index)
+        else:
+            self._grid[index] = 0.0
+            self._nonzero_cells.discard(packed_index)
+        self._cdf_dirty = True
+
+    def padded_view(self, pad: int) -> npt.NDArray[GridValue]:
+        """Returns the grid surrounded by `pad` cells of zeros on each side.
+
+        The padded buffer is reused across calls, so the returned view is only valid until the next call.
+        """
+        if pad < 0:
+            raise ValueError(f"pad ({pad}) must be at least zero.")
+        n_rows, n_cols = self._grid.shape
+        if pad > self._padded_pad:
+            self._padded = np.zeros(
+                (n_rows + 2 * pad, n_cols + 2 * pad), dtype=self._grid.dtype
+            )
+            self._padded_pad = pad
+        offset = self._padded_pad
+        self._padded[offset : offset + n_rows, offset : offset + n_cols] = self._grid
+        offset -= pad
+        return self._padded[
+            offset : offset + n_rows + 2 * pad, offset : offset + n_cols + 2 * pad
+        ]
+
+    def set_many(
+        self, x_keys: npt.ArrayLike, y_keys: npt.ArrayLike, values: npt.ArrayLike
+    ) -> None:
+        """Sets the values of several cells at once. The keys and values are broadcast together."""
+        x_indices, y_indices, values = np.broadcast_arrays(
+            self._x_axis.get_indices(x_keys),
+            self._y_axis.get_indices(y_keys),
+            np.asarray(values, dtype=self._grid.dtype),
+        )
+        is_nonzero = (values >= self._zero_threshold) & self._usable_mask[
+            y_indices, x_indices
+        ]
+        self._grid[y_indices, x_indices] = np.where(is_nonzero, values, 0.0)
+
+        # Keep the nonzero cells in sync with the final contents of the grid, since repeated keys keep the last value.
+        changed_packed = np.unique((y_indices << INDEX_BITS) | x_indices)
+        changed = changed_packed >> INDEX_BITS, changed_packed & _INDEX_MASK
+        new_values = self._grid[changed]
+        is_cell_nonzero = (new_values >= self._zero_threshold) & self._usable_mask[
+            changed
+        ]
+        self._nonzero_cells.difference_update(changed_packed[~is_cell_nonzero].tolist())
+        self._nonzero_cells.update(changed_packed[is_cell_nonzero].tolist())
+        self._cdf_dirty = True
+
+    def rebuild_nonzero_cells(self) -> None:
+        """Rebuilds the nonzero cells from the grid, zeroing any cells below the threshold.
+
+        Call this after modifying `data` directly (e.g., in a predict or update step).
+        """
+        is_nonzero = (self._grid >= self._zero_threshold) & self._usable_mask
+        self._grid[~is_nonzero] = 0.0
+        y_indices, x_indices = np.nonzero(is_nonzero)
+        self._nonzero_cells.clear()
+        self._nonzero_cells.update(((y_indices << INDEX_BITS) | x_indices).tolist())
+        self._cdf_dirty = True
 
     def _get_grid_index(self, key: GridKey) -> GridIndex:
         """Converts grid keys [x_key, y_key] to grid indices [y_idx, x_idx]."""
@@ -163,9 +294,11 @@ class Grid:
         return y_index, x_index
 
     def copy(self) -> "Grid":
-        _copy = Grid(self._x_axis, self._y_axis, self._zero_threshold)
+        _copy = Grid(self._x_axis, self._y_axis, self._zero_threshold, self._grid.dtype)
         _copy._sig_digits = self._sig_digits
         _copy._nonzero_cells = self._nonzero_cells.copy()
+        _copy._usable_mask[:] = self._usable_mask
+        _copy._cdf_dirty = True
         _copy._grid[:] = self._grid
         return _copy
 
@@ -174,14 +307,62 @@ class Grid:
         y_key, x_key = self._y_axis.get_key(index[0]), self._x_axis.get_key(index[1])
         return x_key, y_key
 
+    def _get_nonzero_indices(
+        self,
+    ) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """Unpacks the nonzero cells into arrays of row and column indices."""
+        packed_indices = np.fromiter(
+            self._nonzero_cells, dtype=np.int64, count=len(self._nonzero_cells)
+        )
+        return packed_indices >> INDEX_BITS, packed_indices & _INDEX_MASK
+
     def get_nonzero_cells(self) -> Tuple[GridIndex]:
-        return tuple(self._nonzero_cells)
+        return tuple(
+            zip(*(indices.tolist() for indices in self._get_nonzero_indices()))
+        )
 
-    def get_nonzero_keys(self) -> Tuple[GridKey]:
-        return tuple((self.get_cell_key(index) for index in self.get_nonzero_cells()))
+    def get_nonzero_cdf(self) -> npt.NDArray[GridValue]:
+        """Returns a read-only cumulative sum of the nonzero cell values, ordered like `get_nonzero_keys`."""
+        if self._cdf_dirty:
+            self._cdf = np.cumsum(self.get_nonzero_probs(), dtype=np.float64)
+            self._cdf.flags.writeable = False
+            self._cdf_dirty = False
+        return self._cdf
+
+    def get_nonzero_probs(self) -> npt.NDArray[GridValue]:
+        """Returns the values of the nonzero cells, ordered like `get_nonzero_keys`."""
+        y_indices, x_indices = self._get_nonzero_indices()
+        return self._grid[y_indices, x_indices]
+
+    def get_nonzero_keys(self) -> npt.NDArray[np.float64]:
+        """Returns the keys [x_key, y_key] of the nonzero cells as an (M, 2) array."""
+        y_indices, x_indices = self._get_nonzero_indices()
+        keys = np.empty((len(x_indices), 2), dtype=np.float64)
+        keys[:, 0] = self._x_axis.centers[x_indices]
+        keys[:, 1] = self._y_axis.centers[y_indices]
+        return keys
 
     def set_unusable_cells(self, cells: Iterable[GridIndex]) -> None:
-        pass
+        """Marks grid indices [y_idx, x_idx] as unusable. Unusable cells are cleared and always hold zero."""
+        indices = np.array(list(cells), dtype=np.int64)
+        if indices.size == 0:
+            return
+        if indices.ndim != 2 or indices.shape[1] != 2:
+            raise ValueError("cells must be pairs of grid indices [y_idx, x_idx].")
+        if ((indices < 0) | (indices >= self._grid.shape)).any():
+            raise IndexError(
+                f"cell indices must be within the grid shape {self._grid.shape}."
+            )
+
+        packed_indices = np.unique((indices[:, 0] << INDEX_BITS) | indices[:, 1])
+        y_indices, x_indices = (
+            packed_indices >> INDEX_BITS,
+            packed_indices & _INDEX_MASK,
+        )
+        self._usable_mask[y_indices, x_indices] = False
+        self._grid[y_indices, x_indices] = 0.0
+        self._nonzero_cells.difference_update(packed_indices.tolist())
+        self._cdf_dirty = True
 
     def __repr__(self) -> str:
         return (
@@ -27,6 +27,10 @@ class TestHistogramFilterBase(unittest.TestCase):
         histogram_filter.set_motion_noise(valid_noise)
         self.assertTrue(np.array_equal(histogram_filter.motion_noise, valid_noise))
 
+        # The filter should own its copy of the noise.
+        valid_noise[0, 0] = 0.0
+        self.assertFalse(np.array_equal(histogram_filter.motion_noise, valid_noise))
+
         # Test setting invalid motion noise
         with self.assertRaises(ValueError):
             invalid_noise = np.array([[0.2, 0.3], [0.4, 0.2]])
@@ -63,6 +67,103 @@ class TestHistogramFilterBase(unittest.TestCase):
             )
         )
 
+    def test_sample_float32(self):
+        histogram_filter = HistogramFilterBase(
+            self.x_axis, self.y_axis, dtype=np.float32
+        )
+        histogram_filter[0.05, 0.05] = 0.1
+        histogram_filter[0.2, 0.8] = 0.9
+        samples = histogram_filter.sample(n_samples=5)
+        self.assertEqual(samples.shape, (5, 2))
+
+    def test_sample_after_direct_write(self):
+        histogram_filter = HistogramFilterBase(self.x_axis, self.y_axis, seed=3)
+        histogram_filter[0.05, 0.05] = 0.5
+        histogram_filter[0.9, 0.9] = 0.5
+        _ = histogram_filter.sample(n_samples=10)
+
+        # Writes through the data property should be seen by the next sample once the cells are rebuilt.
+        belief = histogram_filter.belief
+        belief.data[0, 0] = 0.99
+        belief.data[4, 4] = 0.01
+        belief.rebuild_nonzero_cells()
+        samples = histogram_filter.sample(n_samples=1000)
+        self.assertGreater(
+            np.mean(np.all(np.isclose(samples, (0.1, 0.1)), axis=1)), 0.95
+        )
+        self.assertAlmostEqual(belief.total, 1.0)
+
+        # Probabilities that no longer sum to one should be reported.
+        belief.data[0, 0] = 0.5
+        belief.rebuild_nonzero_cells()
+        with self.assertRaises(RuntimeError):
+            histogram_filter.sample()
+
+    def test_unusable_cells(self):
+        histogram_filter = HistogramFilterBase(
+            self.x_axis, self.y_axis, unusable_cells=[(4, 1)]
+        )
+        histogram_filter[0.2, 0.8] = 0.3
+        histogram_filter[0.05, 0.05] = 1.0
+        samples = histogram_filter.sample(n_samples=20)
+        self.assertTrue(all((np.allclose(s, (0.1, 0.1)) for s in samples)))
+
+    def test_rng(self):
+        histogram_filter = HistogramFilterBase(self.x_axis, self.y_axis)
+        self.assertIsNone(histogram_filter._rng)
+        self.assertIsInstance(histogram_filter.rng, np.random.Generator)
+        self.assertIs(histogram_filter.rng, histogram_filter.rng)
+
+        rng = np.random.default_rng()
+        self.assertIs(HistogramFilterBase(self.x_axis, self.y_axis, rng=rng).rng, rng)
+        with self.assertRaises(ValueError):
+            HistogramFilterBase(self.x_axis, self.y_axis, seed=1, rng=rng)
+
+    def test_sample_seed(self):
+        def make_filter(seed):
+            histogram_filter = HistogramFilterBase(self.x_axis, self.y_axis, seed=seed)
+            histogram_filter[0.05, 0.05] = 0.5
+            histogram_filter[0.2, 0.8] = 0.5
+            return histogram_filter
+
+        # The same seed should produce the same samples.
+        samples = make_filter(7).sample(n_samples=20)
+        self.assertTrue(np.array_equal(samples, make_filter(7).sample(n_samples=20)))
+
+        # Filters spawned from a shared SeedSequence should get different streams.
+        seed_seq = np.random.SeedSequence(7)
+        first, second = make_filter(seed_seq), make_filter(seed_seq)
+        self.assertFalse(np.array_equal(first.rng.random(5), second.rng.random(5)))
+
+    def test_apply_motion(self):
+        histogram_filter = HistogramFilterBase(
+            self.x_axis,
+            self.y_axis,
+            motion_noise=[[0.0, 0.25, 0.0], [0.25, 0.5, 0.0], [0.0, 0.0, 0.0]],
+        )
+        histogram_filter[0.5, 0.5] = 1.0
+        histogram_filter._apply_motion()
+
+        belief = histogram_filter.belief
+        self.assertAlmostEqual(belief[0.5, 0.5], 0.5)
+        self.assertAlmostEqual(belief[0.3, 0.5], 0.25)
+        self.assertAlmostEqual(belief[0.5, 0.3], 0.25)
+        self.assertEqual(len(belief.get_nonzero_cells()), 3)
+        self.assertAlmostEqual(belief.total, 1.0)
+
+        # Probability pushed off the edge of the grid should be lost.
+        histogram_filter[0.5, 0.5] = 0.0
+        histogram_filter[0.3, 0.5] = 0.0
+        histogram_filter[0.5, 0.3] = 0.0
+        histogram_filter[0.1, 0.1] = 1.0
+        histogram_filter._apply_motion()
+        self.assertAlmostEqual(belief.total, 0.5)
+
+        # An invalid noise override should be rejected.
+        for noise in ([[0.5, 0.5]], [[0.5, 0.0], [0.0, 0.0]]):
+            with self.assertRaises(ValueError):
+                histogram_filter._apply_motion(noise)
+
 
 if __name__ == "__main__":
     unittest.main()
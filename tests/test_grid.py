@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 from unittest.mock import Mock
 
@@ -36,12 +38,50 @@ class TestGrid(unittest.TestCase):
         with self.assertRaises(ValueError):
             Grid(self.x_axis, self.y_axis, zero_threshold=-0.1)
 
+    def test_dtype(self):
+        # Test that the grid is stored in the requested dtype
+        grid = Grid(self.x_axis, self.y_axis, self.zero_threshold, dtype=np.float32)
+        self.assertEqual(grid.data.dtype, np.float32)
+        grid[(0.2, 0.3)] = 0.5
+        self.assertEqual(grid.copy().dtype, np.float32)
+        self.assertEqual(grid.get_nonzero_cells(), ((3, 2),))
+        with self.assertRaises(TypeError):
+            Grid(self.x_axis, self.y_axis, dtype=np.int32)
+
     def test_data_property(self):
         # Test the data property
         grid = Grid(self.x_axis, self.y_axis)
         self.assertIsInstance(grid.data, np.ndarray)
         self.assertEqual(grid.data.shape, (self.y_axis.n_bins, self.x_axis.n_bins))
 
+    def test_data_view_property(self):
+        # Test the data_view property
+        grid = Grid(self.x_axis, self.y_axis)
+        grid[(0.2, 0.3)] = 0.5
+        view = grid.data_view
+        self.assertTrue(view.flags.c_contiguous)
+        self.assertTrue(np.shares_memory(view, grid.data))
+        with self.assertRaises(ValueError):
+            view[0, 0] = 1.0
+
+    def test_padded_view(self):
+        # Test the padded_view method
+        grid = Grid(self.x_axis, self.y_axis)
+        grid[(0.2, 0.3)] = 0.5
+        padded = grid.padded_view(2)
+        self.assertEqual(padded.shape, (14, 14))
+        self.assertTrue(np.array_equal(padded[2:-2, 2:-2], grid.data))
+        self.assertEqual(np.count_nonzero(padded), 1)
+
+        # Smaller paddings should reuse the larger buffer and see the latest values.
+        grid[(0.5, 0.5)] = 0.25
+        padded = grid.padded_view(1)
+        self.assertEqual(padded.shape, (12, 12))
+        self.assertTrue(np.array_equal(padded[1:-1, 1:-1], grid.data))
+        self.assertEqual(np.count_nonzero(padded), 2)
+        with self.assertRaises(ValueError):
+            grid.padded_view(-1)
+
     def test_volume_property(self):
         # Test the volume property
         grid = Grid(self.x_axis, self.y_axis)
@@ -60,6 +100,91 @@ class TestGrid(unittest.TestCase):
         self.assertTrue(np.allclose(grid.get_nonzero_cells(), (3, 2)))
         self.assertAlmostEqual(grid.data[3, 2], 0.5)
 
+        # Values below the zero threshold should clear the cell.
+        grid[(0.2, 0.3)] = 0.000001
+        self.assertEqual(grid.get_nonzero_cells(), ())
+        self.assertEqual(grid.data[3, 2], 0.0)
+
+        # Out-of-bounds keys should raise without modifying the grid.
+        with self.assertRaises(IndexError):
+            grid[(0.2, 1.5)] = 0.5
+        with self.assertRaises(IndexError):
+            grid[(float("nan"), 0.5)] = 0.5
+        self.assertEqual(np.count_nonzero(grid.data), 0)
+
+    def test_set_many(self):
+        # Test the set_many method
+        grid = Grid(self.x_axis, self.y_axis, self.zero_threshold)
+        grid.set_many([0.2, 0.5], [0.3, 0.5], [0.5, 0.25])
+        self.assertAlmostEqual(grid.data[3, 2], 0.5)
+        self.assertAlmostEqual(grid.data[5, 5], 0.25)
+        self.assertEqual(set(grid.get_nonzero_cells()), {(3, 2), (5, 5)})
+
+        # Values below the zero threshold should clear the cells.
+        grid.set_many([0.2, 0.5], [0.3, 0.5], 0.0)
+        self.assertEqual(grid.get_nonzero_cells(), ())
+        self.assertEqual(np.count_nonzero(grid.data), 0)
+
+        # Repeated keys should keep the last value.
+        grid.set_many([0.5, 0.5], [0.5, 0.5], [0.5, 0.0])
+        self.assertEqual(grid.data[5, 5], 0.0)
+        self.assertEqual(grid.get_nonzero_cells(), ())
+        self.assertEqual(grid.total, 0.0)
+        grid.set_many([0.5, 0.5], [0.5, 0.5], [0.0, 0.5])
+        self.assertEqual(grid.data[5, 5], 0.5)
+        self.assertEqual(grid.get_nonzero_cells(), ((5, 5),))
+
+    def test_total_property(self):
+        # Test that the total follows the grid
+        grid = Grid(self.x_axis, self.y_axis, self.zero_threshold)
+        grid[(0.2, 0.3)] = 0.5
+        grid[(0.5, 0.5)] = 0.25
+        grid[(0.2, 0.3)] = 0.125
+        self.assertAlmostEqual(grid.total, 0.375)
+
+        grid.set_many([0.5, 0.5, 0.9], [0.5, 0.5, 0.9], [0.5, 0.25, 0.001])
+        self.assertAlmostEqual(grid.total, grid.data.sum())
+        self.assertAlmostEqual(grid.copy().total, grid.total)
+
+    def test_rebuild_nonzero_cells(self):
+        # Test the rebuild_nonzero_cells method after writing to data directly
+        grid = Grid(self.x_axis, self.y_axis, self.zero_threshold)
+        grid[(0.2, 0.3)] = 0.5
+        grid.data[3, 2] = 0.0
+        grid.data[5, 5] = 0.75
+        grid.data[6, 6] = 0.001
+        grid.rebuild_nonzero_cells()
+        self.assertEqual(grid.get_nonzero_cells(), ((5, 5),))
+        self.assertEqual(grid.data[6, 6], 0.0)
+        self.assertAlmostEqual(grid.total, 0.75)
+        self.assertTrue(np.allclose(grid.get_nonzero_cdf(), (0.75,)))
+
+    def test_set_unusable_cells(self):
+        # Test the set_unusable_cells method
+        grid = Grid(self.x_axis, self.y_axis, self.zero_threshold)
+        grid[(0.2, 0.3)] = 0.5
+        grid[(0.5, 0.5)] = 0.25
+        grid.set_unusable_cells([(3, 2), (3, 2), (0, 0)])
+        self.assertFalse(grid.usable_mask[3, 2])
+        self.assertFalse(grid.usable_mask[0, 0])
+        self.assertEqual(grid.get_nonzero_cells(), ((5, 5),))
+        self.assertEqual(grid.data[3, 2], 0.0)
+        self.assertAlmostEqual(grid.total, 0.25)
+
+        # Unusable cells should ignore new values.
+        grid[(0.2, 0.3)] = 0.5
+        grid.set_many([0.05], [0.05], [0.5])
+        self.assertEqual(grid.get_nonzero_cells(), ((5, 5),))
+        self.assertEqual(np.count_nonzero(grid.data), 1)
+        self.assertFalse(grid.copy().usable_mask[3, 2])
+        with self.assertRaises(IndexError):
+            grid.set_unusable_cells([(10, 0)])
+        for cells in ([(0, 1, 2, 3)], [0, 1], [(0,)]):
+            with self.assertRaises(ValueError):
+                grid.set_unusable_cells(cells)
+        grid.set_unusable_cells([])
+        self.assertEqual(np.count_nonzero(~grid.usable_mask), 2)
+
     def test_copy(self):
         # Test the copy method
         grid = Grid(self.x_axis, self.y_axis)
@@ -67,6 +192,36 @@ class TestGrid(unittest.TestCase):
         copy = grid.copy()
         self.assertEqual(grid, copy)
 
+        # Setting a value in the copy should not affect the original.
+        copy[(0.5, 0.5)] = 0.25
+        self.assertEqual(len(grid.get_nonzero_cells()), 1)
+        self.assertEqual(len(copy.get_nonzero_cells()), 2)
+        self.assertAlmostEqual(grid.data[5, 5], 0.0)
+
+    def test_deepcopy_and_pickle(self):
+        # Test that deep copies and pickled grids do not share storage with the original
+        grid = Grid(self.x_axis, self.y_axis)
+        grid[(0.2, 0.3)] = 0.5
+        for other in (copy.deepcopy(grid), pickle.loads(pickle.dumps(grid))):
+            self.assertEqual(grid, other)
+            other[(0.5, 0.5)] = 0.25
+            self.assertEqual(len(grid.get_nonzero_cells()), 1)
+            self.assertEqual(len(other.get_nonzero_cells()), 2)
+            self.assertAlmostEqual(grid.data[5, 5], 0.0)
+
+    def test_eq(self):
+        # Test the __eq__ method
+        grid = Grid(self.x_axis, self.y_axis)
+        grid[(0.2, 0.3)] = 0.5
+        other = grid.copy()
+        other[(0.2, 0.3)] = 0.5 + 1e-12
+        self.assertEqual(grid, other)
+
+        other[(0.5, 0.5)] = 0.25
+        self.assertNotEqual(grid, other)
+        self.assertNotEqual(grid, Grid(self.x_axis, self.y_axis))
+        self.assertNotEqual(grid, "grid")
+
     def test_get_cell_key(self):
         # Test the get_cell_key method
         grid = Grid(self.x_axis, self.y_axis)
@@ -92,7 +247,37 @@ class TestGrid(unittest.TestCase):
         grid = Grid(self.x_axis, self.y_axis)
         grid[(0.2, 0.3)] = 0.5
         nonzero_keys = grid.get_nonzero_keys()
+        self.assertEqual(nonzero_keys.shape, (1, 2))
         self.assertTrue(np.allclose(nonzero_keys, (0.25, 0.35)))
+        self.assertEqual(
+            Grid(self.x_axis, self.y_axis).get_nonzero_keys().shape, (0, 2)
+        )
+
+    def test_get_nonzero_probs(self):
+        # Test the get_nonzero_probs method
+        grid = Grid(self.x_axis, self.y_axis)
+        grid[(0.2, 0.3)] = 0.25
+        grid[(0.5, 0.5)] = 0.75
+        probs = dict(zip(grid.get_nonzero_cells(), grid.get_nonzero_probs()))
+        self.assertAlmostEqual(probs[(3, 2)], 0.25)
+        self.assertAlmostEqual(probs[(5, 5)], 0.75)
+
+    def test_get_nonzero_cdf(self):
+        # Test the get_nonzero_cdf method
+        grid = Grid(self.x_axis, self.y_axis)
+        self.assertEqual(len(grid.get_nonzero_cdf()), 0)
+        grid[(0.2, 0.3)] = 0.25
+        grid[(0.5, 0.5)] = 0.75
+        self.assertTrue(
+            np.allclose(grid.get_nonzero_cdf(), np.cumsum(grid.get_nonzero_probs()))
+        )
+        self.assertAlmostEqual(grid.get_nonzero_cdf()[-1], 1.0)
+        self.assertFalse(grid.get_nonzero_cdf().flags.writeable)
+
+        # The CDF should follow changes to the grid, including in copies.
+        grid[(0.2, 0.3)] = 0.0
+        self.assertTrue(np.allclose(grid.get_nonzero_cdf(), (0.75,)))
+        self.assertTrue(np.allclose(grid.copy().get_nonzero_cdf(), (0.75,)))
 
 
 if __name__ == "__main__":
@@ -73,6 +73,49 @@ class GridAxisTestCase(unittest.TestCase):
         self.assertEqual(axis.get_index(0.0), 0)
         self.assertEqual(axis.get_index(1.0), 9)
 
+        # Keys on a bin edge should land in the upper bin despite rounding errors.
+        self.assertEqual(axis.get_index(0.3), 3)
+        self.assertEqual(axis.get_index(0.7), 7)
+        self.assertEqual(axis.get_index(0.999999999), 9)
+
+        # Out-of-bounds and NaN keys should raise.
+        for key in (-0.1, 1.1, float("nan")):
+            with self.assertRaises(IndexError):
+                axis.get_index(key)
+
+    def test_get_indices(self):
+        # Test the get_indices method
+        axis = GridAxis(name="X", min=0.0, max=1.0, size=0.1)
+        indices = axis.get_indices([0.35, 0.0, 1.0])
+        self.assertEqual(indices.tolist(), [3, 0, 9])
+        self.assertEqual(
+            indices.tolist(), [axis.get_index(k) for k in (0.35, 0.0, 1.0)]
+        )
+        for keys in ([0.5, 1.1], [-0.1], [0.5, float("nan")]):
+            with self.assertRaises(IndexError):
+                axis.get_indices(keys)
+        with self.assertRaisesRegex(IndexError, r"key \(1\.1\)"):
+            axis.get_indices([0.5, 1.1, 2.0])
+
+    def test_get_index_matches_get_indices(self):
+        # The scalar and vectorized conversions should agree on and around every bin edge, with and without the
+        # epsilon shift.
+        for axis in (
+            GridAxis(name="X", min=0.0, max=1.0, size=0.1),
+            GridAxis(name="X", min=-3.3, max=7.1, size=0.3),
+            GridAxis(name="X", min=-1000.0, max=1000.0, size=0.01),
+        ):
+            edges = np.arange(axis.n_bins + 1, dtype=np.float64)
+            edges = axis.min + np.concatenate((edges, edges - axis.epsilon)) * axis.size
+            keys = np.concatenate(
+                (edges, np.nextafter(edges, -np.inf), np.nextafter(edges, np.inf))
+            )
+            keys = keys[(keys >= axis.min) & (keys <= axis.max)]
+            self.assertEqual(
+                axis.get_indices(keys).tolist(),
+                [axis.get_index(k) for k in keys.tolist()],
+            )
+
     def test_get_key(self):
         # Test the get_key method
         axis = GridAxis(name="X", min=-1.0, max=0.0, size=0.1)
@@ -80,6 +123,14 @@ class GridAxisTestCase(unittest.TestCase):
         self.assertTrue(np.isclose(axis.get_key(0), -0.95))
         self.assertTrue(np.isclose(axis.get_key(9), -0.05))
 
+    def test_centers(self):
+        # Test the centers property
+        axis = GridAxis(name="X", min=-1.0, max=0.0, size=0.1)
+        self.assertEqual(axis.centers.shape, (10,))
+        self.assertTrue(
+            np.allclose(axis.centers, [axis.get_key(i) for i in range(axis.n_bins)])
+        )
+
     def test_eq(self):
         # Test the __eq__ method
         axis1 = GridAxis(name="X", min=0.0, max=1.0, size=0.1)